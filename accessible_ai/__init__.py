@@ -0,0 +1 @@
+"""Accessible AI sign language tools: transcript server, search and SiGML capture."""
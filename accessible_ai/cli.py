@@ -0,0 +1,202 @@
+import argparse
+import os
+import sys
+
+from .config import CONFIG_ENV, ConfigError, index_path, load_config, transcript_languages
+
+# Subcommands import what they need when they run, so that `--help` and
+# the quick commands start without loading Flask, OpenCV or the Gemini SDK.
+
+
+def cmd_serve(args, config):
+    from .server import run
+
+    run(host=args.host, port=args.port, debug=args.debug or None)
+
+
+def _index(config):
+    from .search_index import TranscriptIndex
+
+    return TranscriptIndex(index_path(config))
+
+
+def cmd_fetch(args, config):
+    from .transcripts import download_transcript, format_timeline, save_transcript_to_file
+
+    transcript = download_transcript(args.video_id, transcript_languages(config))
+    print(f"Total segments: {len(transcript)}")
+
+    # Print first few segments as example
+    for segment in transcript[:args.show]:
+        print(format_timeline(segment))
+
+    if not args.no_save:
+        save_transcript_to_file(args.video_id, transcript, config['TRANSCRIPTS_DIR'], _index(config))
+    return 0
+
+
+def cmd_batch_fetch(args, config):
+    from .transcripts import download_transcript, save_transcript_to_file
+
+    video_ids = list(args.video_ids)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            video_ids += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    index = _index(config)
+    failed = []
+    for video_id in video_ids:
+        try:
+            transcript = download_transcript(video_id, transcript_languages(config))
+        except Exception as e:
+            print(f"Error fetching transcript for {video_id}: {e}")
+            failed.append(video_id)
+            continue
+        if not save_transcript_to_file(video_id, transcript, config['TRANSCRIPTS_DIR'], index):
+            failed.append(video_id)
+
+    if args.reindex:
+        print(f"{index.ingest_directory(config['TRANSCRIPTS_DIR'])} transcripts indexed or removed")
+
+    print(f"Fetched {len(video_ids) - len(failed)} of {len(video_ids)} transcripts")
+    if failed:
+        print("Failed: " + ", ".join(failed))
+        return 1
+    return 0
+
+
+def cmd_record(args, config):
+    from .capture import record_video
+
+    record_video(args.output or config['VIDEO_FILENAME'], args.duration or config['RECORD_DURATION'])
+    return 0
+
+
+def cmd_extract(args, config):
+    from .capture import extract_all_frames
+
+    extract_all_frames(args.video or config['VIDEO_FILENAME'], args.frames or config['FRAME_DIR'])
+    return 0
+
+
+def cmd_generate(args, config):
+    from .capture import generate_sigml_from_frames, save_sigml, validate_sigml
+
+    if args.prompt:
+        from .sigml_chat import generate
+
+        content = generate(args.prompt, config['GEMINI_API_KEY'])
+    else:
+        content = generate_sigml_from_frames(
+            args.frames or config['FRAME_DIR'],
+            args.word,
+            config['GEMINI_API_KEY'],
+            config['GEMINI_MODEL'],
+            config['MAX_FRAMES'],
+        )
+
+    output = args.output or config['OUTPUT_SIGML']
+    save_sigml(content, output)
+    with open(output, 'r', encoding='utf-8') as f:
+        problems = validate_sigml(f.read())
+    for problem in problems:
+        print(f"Warning: {problem}")
+    return 0
+
+
+def cmd_validate(args, config):
+    from .capture import validate_sigml
+    from .rechunk import estimate_sigml_seconds
+
+    status = 0
+    for filename in args.files:
+        with open(filename, 'r', encoding='utf-8') as f:
+            content = f.read()
+        problems = validate_sigml(content)
+        if problems:
+            status = 1
+            for problem in problems:
+                print(f"{filename}: {problem}")
+        else:
+            print(f"{filename}: ok (about {estimate_sigml_seconds(content):.1f}s to sign)")
+    return status
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='accessible_ai',
+        description="Sign language tools: transcript server, transcript fetching and SiGML capture.",
+    )
+    parser.add_argument('--config', help=f"JSON settings file (default: ${CONFIG_ENV})")
+    parser.add_argument('--profile', metavar='FILE', help="write cProfile stats for the command to FILE")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help="run the transcript API server")
+    serve.add_argument('--host')
+    serve.add_argument('--port', type=int)
+    serve.add_argument('--debug', action='store_true', help="enable Flask debug mode")
+    serve.set_defaults(func=cmd_serve)
+
+    fetch = commands.add_parser('fetch', help="fetch and save one video's transcript")
+    fetch.add_argument('video_id')
+    fetch.add_argument('--show', type=int, default=3, help="number of segments to print (default: 3)")
+    fetch.add_argument('--no-save', action='store_true', help="print only, don't save or index")
+    fetch.set_defaults(func=cmd_fetch)
+
+    batch = commands.add_parser('batch-fetch', help="fetch and save transcripts for many videos")
+    batch.add_argument('video_ids', nargs='*')
+    batch.add_argument('-f', '--file', help="file with one video ID per line")
+    batch.add_argument('--reindex', action='store_true',
+                       help="also sync the index with the transcripts directory")
+    batch.set_defaults(func=cmd_batch_fetch)
+
+    record = commands.add_parser('record', help="record a sign from the webcam")
+    record.add_argument('-o', '--output', help="video file to write")
+    record.add_argument('-d', '--duration', type=float, help="seconds to record")
+    record.set_defaults(func=cmd_record)
+
+    extract = commands.add_parser('extract', help="split a recorded video into frames")
+    extract.add_argument('--video', help="video file to read")
+    extract.add_argument('--frames', help="directory to write frames to")
+    extract.set_defaults(func=cmd_extract)
+
+    generate = commands.add_parser('generate', help="generate SiGML with Gemini")
+    source = generate.add_mutually_exclusive_group(required=True)
+    source.add_argument('--word', help="word signed in the extracted frames")
+    source.add_argument('--prompt', help="describe a sign in text instead of using frames")
+    generate.add_argument('--frames', help="directory of frames to send")
+    generate.add_argument('-o', '--output', help=".sigml file to write")
+    generate.set_defaults(func=cmd_generate)
+
+    validate = commands.add_parser('validate', help="check .sigml files")
+    validate.add_argument('files', nargs='+')
+    validate.set_defaults(func=cmd_validate)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.config:
+        # Also picked up by the server module's own load_config()
+        os.environ[CONFIG_ENV] = args.config
+    try:
+        config = load_config()
+    except ConfigError as e:
+        parser.error(str(e))
+
+    if not args.profile:
+        sys.exit(args.func(args, config))
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        status = args.func(args, config)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"Profile written to {args.profile}")
+    sys.exit(status)
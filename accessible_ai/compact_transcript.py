@@ -0,0 +1,189 @@
+import json
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+# Binary layout: header, then starts, durations, text offsets and the UTF-8
+# text arena, all little-endian.
+BINARY_MAGIC = b'CTR1'
+BINARY_HEADER = struct.Struct('<4sII')  # magic, segment count, arena bytes
+
+# Default memory budget for TranscriptCache
+TRANSCRIPT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class CompactTranscript:
+    """Transcript stored as parallel columns instead of a list of dicts.
+
+    Start times and durations are float64 columns and the segment texts are
+    concatenated into one UTF-8 arena addressed by an offsets column, which
+    costs roughly 20 bytes per segment plus the text itself. Slicing by index
+    or time returns a new CompactTranscript sharing the same buffers.
+
+    Indexing and iteration yield plain segment dicts
+    ({'start', 'duration', 'text'}), so code written against the list
+    returned by YouTubeTranscriptApi keeps working. The dicts are copies;
+    use from_segments() to build a modified transcript.
+
+    Segments are expected in ascending start order, as YouTube returns them;
+    the time-based lookups rely on it.
+    """
+
+    __slots__ = ('starts', 'durations', '_offsets', '_arena')
+
+    def __init__(self, starts, durations, offsets, arena):
+        self.starts = starts
+        self.durations = durations
+        self._offsets = offsets
+        self._arena = arena
+
+    @classmethod
+    def from_segments(cls, segments):
+        starts = array('d')
+        durations = array('d')
+        offsets = array('I', [0])
+        arena = bytearray()
+        for segment in segments:
+            starts.append(segment['start'])
+            durations.append(segment['duration'])
+            arena += segment['text'].encode('utf-8')
+            offsets.append(len(arena))
+        return cls(memoryview(starts), memoryview(durations), memoryview(offsets), memoryview(bytes(arena)))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def text(self, index):
+        """Text of one segment, decoded from the arena"""
+        return str(self._arena[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+    def end(self, index):
+        return self.starts[index] + self.durations[index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("CompactTranscript slices must be contiguous")
+            stop = max(start, stop)
+            return CompactTranscript(
+                self.starts[start:stop],
+                self.durations[start:stop],
+                self._offsets[start:stop + 1],
+                self._arena,
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transcript index out of range")
+        return {'start': self.starts[index], 'duration': self.durations[index], 'text': self.text(index)}
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def between(self, start_time, end_time):
+        """Segments starting in [start_time, end_time), without copying"""
+        return self[bisect_left(self.starts, start_time):bisect_left(self.starts, end_time)]
+
+    def index_at(self, time):
+        """Index of the last segment that has started by `time` and not yet ended, or -1"""
+        index = bisect_right(self.starts, time) - 1
+        if index >= 0 and time < self.end(index):
+            return index
+        return -1
+
+    @property
+    def nbytes(self):
+        """Bytes held by this transcript's columns and the arena span it uses"""
+        text_bytes = self._offsets[-1] - self._offsets[0]
+        return self.starts.nbytes + self.durations.nbytes + self._offsets.nbytes + text_bytes
+
+    def to_list(self):
+        return list(self)
+
+    def to_json(self):
+        """Serialize as the JSON list /api/transcript has always returned"""
+        parts = []
+        for index in range(len(self)):
+            parts.append(
+                '{"start": %s, "duration": %s, "text": %s}'
+                % (json.dumps(self.starts[index]), json.dumps(self.durations[index]),
+                   json.dumps(self.text(index), ensure_ascii=False))
+            )
+        return '[' + ', '.join(parts) + ']'
+
+    def to_bytes(self):
+        """Serialize to the compact binary form read by from_bytes()"""
+        # Offsets are absolute within a shared arena; slices (even empty
+        # ones) start wherever their first offset points
+        base = self._offsets[0]
+        offsets = array('I', (offset - base for offset in self._offsets))
+        arena = self._arena[base:base + offsets[-1]]
+        starts = array('d', self.starts)
+        durations = array('d', self.durations)
+        if sys.byteorder == 'big':
+            for column in (starts, durations, offsets):
+                column.byteswap()
+        return b''.join((
+            BINARY_HEADER.pack(BINARY_MAGIC, len(self), len(arena)),
+            starts.tobytes(), durations.tobytes(), offsets.tobytes(), bytes(arena),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Load a transcript written by to_bytes(); columns view `data` directly where possible"""
+        magic, count, arena_size = BINARY_HEADER.unpack_from(data)
+        if magic != BINARY_MAGIC:
+            raise ValueError("not a compact transcript")
+        view = memoryview(data)
+        pos = BINARY_HEADER.size
+        columns = []
+        for typecode, length in (('d', count), ('d', count), ('I', count + 1)):
+            size = array(typecode).itemsize * length
+            chunk = view[pos:pos + size]
+            if sys.byteorder == 'big':
+                swapped = array(typecode, chunk.tobytes())
+                swapped.byteswap()
+                chunk = memoryview(swapped)
+            columns.append(chunk.cast(typecode))
+            pos += size
+        arena = view[pos:pos + arena_size]
+        if len(arena) != arena_size:
+            raise ValueError("truncated compact transcript")
+        return cls(columns[0], columns[1], columns[2], arena)
+
+
+class TranscriptCache:
+    """LRU cache of CompactTranscripts bounded by total bytes rather than entry count"""
+
+    def __init__(self, max_bytes=TRANSCRIPT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, video_id):
+        with self._lock:
+            transcript = self._entries.get(video_id)
+            if transcript is not None:
+                self._entries.move_to_end(video_id)
+            return transcript
+
+    def put(self, video_id, transcript):
+        with self._lock:
+            old = self._entries.pop(video_id, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._entries[video_id] = transcript
+            self.nbytes += transcript.nbytes
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,103 @@
+import json
+import os
+
+# Environment variable naming a JSON config file, set by `--config` on the CLI
+CONFIG_ENV = 'ACCESSIBLE_AI_CONFIG'
+
+# Settings are read from the environment as ACCESSIBLE_AI_<NAME>, except
+# these, which keep the name other tools already use for them
+ENV_PREFIX = 'ACCESSIBLE_AI_'
+UNPREFIXED = ('GEMINI_API_KEY',)
+
+# Every setting, with its default. Values from the config file override
+# these, and environment variables (see env_name) override both.
+DEFAULTS = {
+    'HOST': '127.0.0.1',
+    'PORT': 5000,
+    'DEBUG': False,
+    'TRANSCRIPTS_DIR': 'transcripts',
+    'TRANSCRIPT_LANGUAGES': 'en,ml,ta,hi',
+    # os.pathsep-separated sources for the avatar's lexicon: the
+    # sigmlData.json list of {"w": word, "s": sigml} that
+    # extension/working.html loads, and directories of .sigml files like
+    # the custom signs made with `accessible_ai generate`
+    'LEXICON_PATH': os.pathsep.join([os.path.join('extension', 'SignFiles', 'sigmlData.json'), 'customize_option']),
+    # Seconds signing may lag the speech before words are left unsigned; 0 is no limit
+    'MAX_SIGN_LAG': 0.0,
+    'GEMINI_API_KEY': '',
+    'GEMINI_MODEL': 'models/gemini-1.5-flash',
+    'VIDEO_FILENAME': os.path.join('customize_option', 'sign_language_video.avi'),
+    'FRAME_DIR': os.path.join('customize_option', 'video_frames'),
+    'RECORD_DURATION': 6,
+    'MAX_FRAMES': 8,
+    'OUTPUT_SIGML': os.path.join('customize_option', 'output.sigml'),
+}
+
+
+class ConfigError(ValueError):
+    """The config file can't be read, or a setting is unknown or has a bad value"""
+
+
+def env_name(key):
+    """Environment variable that overrides setting `key`"""
+    return key if key in UNPREFIXED else ENV_PREFIX + key
+
+
+def _coerce(key, value, source):
+    default = DEFAULTS[key]
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in ('1', 'true', 'yes', 'on'):
+            return True
+        if text in ('0', 'false', 'no', 'off', ''):
+            return False
+        raise ConfigError(f"{source}: expected true or false, got {value!r}")
+    if isinstance(default, float):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ConfigError(f"{source}: expected a number, got {value!r}") from None
+    if isinstance(default, int):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ConfigError(f"{source}: expected an integer, got {value!r}") from None
+    return str(value)
+
+
+def load_config(path=None):
+    """Settings from DEFAULTS, then the JSON file at `path` (or $ACCESSIBLE_AI_CONFIG), then the environment.
+
+    Raises ConfigError for an unreadable file, an unknown setting or a
+    value of the wrong type.
+    """
+    config = dict(DEFAULTS)
+    path = path or os.environ.get(CONFIG_ENV)
+    if path:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ConfigError(f"can't read config file {path}: {e}") from None
+        if not isinstance(overrides, dict):
+            raise ConfigError(f"{path}: expected a JSON object of settings")
+        for key, value in overrides.items():
+            if key not in DEFAULTS:
+                raise ConfigError(f"{path}: unknown setting {key}")
+            config[key] = _coerce(key, value, f"{key} in {path}")
+    for key in DEFAULTS:
+        name = env_name(key)
+        if name in os.environ:
+            config[key] = _coerce(key, os.environ[name], name)
+    return config
+
+
+def index_path(config):
+    """The search index database, kept with the transcripts it indexes"""
+    return os.path.join(config['TRANSCRIPTS_DIR'], 'index.db')
+
+
+def transcript_languages(config):
+    return [lang.strip() for lang in config['TRANSCRIPT_LANGUAGES'].split(',') if lang.strip()]
@@ -0,0 +1,202 @@
+import heapq
+import threading
+import time
+import uuid
+
+# How far ahead of a segment's start time it is pushed to the client, in
+# media seconds. Gives the avatar time to load the sign before it is needed.
+PUSH_LEAD_SECONDS = 0.5
+
+# Sessions that have not received a clock update or been streamed for this
+# long are dropped by SessionRegistry.expire().
+SESSION_IDLE_TIMEOUT = 15 * 60
+
+# Upper bound on how long a stream waits without sending anything, so that
+# proxies keep the connection open and dead clients are noticed.
+KEEPALIVE_SECONDS = 15.0
+
+
+class PlaybackClock:
+    """Mirror of the client's video clock, driven by play/pause/seek/rate events"""
+
+    def __init__(self, position=0.0, rate=1.0, playing=False, now=None):
+        self.position = position
+        self.rate = rate
+        self.playing = playing
+        self.anchor = time.monotonic() if now is None else now
+
+    def position_at(self, now):
+        """Media time at wall-clock time `now`"""
+        if not self.playing:
+            return self.position
+        return self.position + (now - self.anchor) * self.rate
+
+    def seconds_until(self, media_time, now):
+        """Wall-clock seconds until the clock reaches `media_time` (None if paused)"""
+        if not self.playing or self.rate <= 0:
+            return None
+        return max(0.0, (media_time - self.position_at(now)) / self.rate)
+
+    def update(self, event, position=None, rate=None, now=None):
+        now = time.monotonic() if now is None else now
+        self.position = self.position_at(now) if position is None else float(position)
+        self.anchor = now
+        if rate is not None:
+            self.rate = float(rate)
+        if event == 'play':
+            self.playing = True
+        elif event == 'pause':
+            self.playing = False
+
+
+class PlaybackSession:
+    """Per-viewer scheduler that releases transcript segments ahead of the playback clock.
+
+    Pending segments live in a heap keyed by the media time at which they
+    should be pushed (start - PUSH_LEAD_SECONDS). A seek rebuilds the heap from
+    the segments still ahead of the new position; play/pause/rate only move the
+    clock, so the heap is untouched.
+
+    `transcript` is a CompactTranscript, usually shared with other sessions
+    watching the same video through the server's transcript cache.
+
+    Only one stream reads from a session at a time: attach() hands out a
+    stream id, and an older stream (e.g. one left behind when EventSource
+    reconnects) stops as soon as a newer one attaches.
+    """
+
+    def __init__(self, video_id, transcript, session_id=None, lead=PUSH_LEAD_SECONDS):
+        self.session_id = session_id or uuid.uuid4().hex
+        self.video_id = video_id
+        self.transcript = transcript
+        self.lead = lead
+        self.clock = PlaybackClock()
+        self.closed = False
+        self.last_seen = time.monotonic()
+        self._heap = []
+        self._stream = 0
+        self._cond = threading.Condition()
+        self._reschedule(0.0)
+
+    def _reschedule(self, position):
+        # Segments still on screen at `position` are pushed again so a seek
+        # into the middle of a segment shows it immediately.
+        starts = self.transcript.starts
+        durations = self.transcript.durations
+        self._heap = [
+            (starts[index] - self.lead, index)
+            for index in range(len(starts))
+            if starts[index] + durations[index] > position
+        ]
+        heapq.heapify(self._heap)
+
+    def update(self, event, position=None, rate=None):
+        """Apply a clock event from the client: play, pause, seek or rate"""
+        with self._cond:
+            now = time.monotonic()
+            self.clock.update(event, position, rate, now)
+            if event == 'seek':
+                self._reschedule(self.clock.position)
+            self.last_seen = now
+            self._cond.notify_all()
+
+    def attach(self):
+        """Make a new stream the session's only reader; returns its stream id.
+
+        Segments an earlier stream may have popped but never delivered are
+        re-armed from the current position.
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._stream += 1
+            self._reschedule(self.clock.position_at(now))
+            self.last_seen = now
+            self._cond.notify_all()
+            return self._stream
+
+    def is_active(self, stream):
+        return not self.closed and stream == self._stream
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def pop_due(self, now=None):
+        """Remove and return the (index, segment) pairs whose push time has been reached"""
+        now = time.monotonic() if now is None else now
+        position = self.clock.position_at(now)
+        due = []
+        while self._heap and self._heap[0][0] <= position:
+            _, index = heapq.heappop(self._heap)
+            due.append((index, self.transcript[index]))
+        return due
+
+    def next_wakeup(self, now=None):
+        """Wall-clock seconds until the next segment is due (None if idle)"""
+        if not self._heap:
+            return None
+        now = time.monotonic() if now is None else now
+        return self.clock.seconds_until(self._heap[0][0], now)
+
+    def wait_for_due(self, stream, keepalive=KEEPALIVE_SECONDS):
+        """Block until segments are due, the clock changes, or `keepalive` expires.
+
+        Returns the list of due (index, segment) pairs, which is empty on a
+        keepalive timeout or after a clock change with nothing due yet, or
+        None once `stream` has been replaced or the session closed.
+        """
+        with self._cond:
+            if not self.is_active(stream):
+                return None
+            due = self.pop_due()
+            if due:
+                return due
+            timeout = self.next_wakeup()
+            if timeout is None or timeout > keepalive:
+                timeout = keepalive
+            self._cond.wait(timeout)
+            if not self.is_active(stream):
+                return None
+            self.last_seen = time.monotonic()
+            return self.pop_due()
+
+
+class SessionRegistry:
+    """Thread-safe map of session id -> PlaybackSession"""
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self, video_id, transcript):
+        session = PlaybackSession(video_id, transcript)
+        with self._lock:
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def drop(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session:
+            session.close()
+        return session is not None
+
+    def expire(self):
+        """Drop sessions idle for longer than idle_timeout; returns how many"""
+        cutoff = time.monotonic() - self.idle_timeout
+        with self._lock:
+            stale = [sid for sid, s in self._sessions.items() if s.last_seen < cutoff]
+            sessions = [self._sessions.pop(sid) for sid in stale]
+        for session in sessions:
+            session.close()
+        return len(sessions)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
@@ -0,0 +1,257 @@
+import glob
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from .compact_transcript import CompactTranscript
+
+# The avatar (extension/working.html) holds each sign for its estimated
+# duration, estimate_sigml_seconds() of its SiGML. A word found in the
+# lexicon is one sign; any other word is fingerspelled, one sign per
+# character that has one, and characters without one are skipped. Without
+# letter signs in the lexicon fingerspelling can't be predicted, so such
+# words are taken to be one sign of SIGN_SECONDS.
+SIGN_SECONDS = 2.0
+
+# Rough cost of the parts of a HamNoSys manual description, in seconds
+SIGML_BASE_SECONDS = 0.6
+SIGML_MOVEMENT_SECONDS = 0.35
+SIGML_PAUSE_SECONDS = 0.4
+SIGML_REPEAT_FACTOR = 2.0
+SIGML_MIN_SECONDS = 0.6
+SIGML_MAX_SECONDS = 4.0
+
+MOVEMENT_PREFIXES = ('hammove', 'hamcircle', 'hamarc', 'hamspiral', 'hamzigzag', 'hamwave',
+                     'hamellipse', 'hamfingerplay', 'hamswinging', 'hamtwisting', 'hamnodding')
+PAUSE_TAGS = ('hampause', 'hamhold')
+
+# Window limits for rechunk(), in seconds of speech
+MIN_WINDOW_SECONDS = 3.0
+MAX_WINDOW_SECONDS = 8.0
+# A silence this long always ends a window
+GAP_SECONDS = 1.5
+
+SENTENCE_END = re.compile(r'[.!?;:]["\')\]]*$')
+NON_SPEECH = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+
+
+def estimate_sigml_seconds(sigml):
+    """Rough estimate of how long a SiGML document takes to perform.
+
+    This is the per-gloss duration model shared by the schedule and the
+    avatar page, which holds each sign for this long (keep the copy in
+    extension/working.html in step).
+    """
+    try:
+        root = ET.fromstring(sigml.strip())
+    except ET.ParseError:
+        return SIGN_SECONDS
+
+    total = 0.0
+    for sign in root.iter('hns_sign'):
+        seconds = SIGML_BASE_SECONDS
+        movement = 0.0
+        repeat = 1.0
+        manual = sign.find('hamnosys_manual')
+        for element in (manual.iter() if manual is not None else ()):
+            tag = element.tag
+            if tag.startswith(MOVEMENT_PREFIXES):
+                movement += SIGML_MOVEMENT_SECONDS
+            elif tag in PAUSE_TAGS:
+                seconds += SIGML_PAUSE_SECONDS
+            elif tag.startswith('hamrepeat'):
+                repeat = SIGML_REPEAT_FACTOR
+        seconds += movement * repeat
+        total += min(max(seconds, SIGML_MIN_SECONDS), SIGML_MAX_SECONDS)
+    return total or SIGN_SECONDS
+
+
+class SignLexicon:
+    """The avatar's word -> SiGML lookup, and the time the avatar spends on each word"""
+
+    def __init__(self, signs=None):
+        self.signs = {}
+        # Estimated seconds per gloss, from its SiGML
+        self.seconds = {}
+        # Whether the lexicon has letter signs to fingerspell with
+        self.spells = False
+        for word, sigml in (signs or {}).items():
+            self.add(word, sigml)
+
+    def add(self, word, sigml):
+        word = word.lower()
+        self.signs[word] = sigml
+        self.seconds[word] = estimate_sigml_seconds(sigml)
+        self.spells = self.spells or len(word) == 1
+
+    @classmethod
+    def load(cls, path):
+        """Load sigmlData.json files and directories of .sigml files, separated by os.pathsep"""
+        lexicon = cls()
+        for part in path.split(os.pathsep):
+            if os.path.isdir(part):
+                for filename in sorted(glob.glob(os.path.join(part, '*.sigml'))):
+                    try:
+                        root = ET.parse(filename).getroot()
+                    except ET.ParseError as e:
+                        print(f"Skipping {filename}: {e}")
+                        continue
+                    # A file may hold several signs; each gloss gets only its own
+                    for sign in root.iter('hns_sign'):
+                        if sign.get('gloss'):
+                            lexicon.add(sign.get('gloss'), '<sigml>' + ET.tostring(sign, encoding='unicode') + '</sigml>')
+            elif os.path.isfile(part):
+                with open(part, 'r', encoding='utf-8') as f:
+                    for entry in json.load(f):
+                        lexicon.add(entry['w'], entry['s'])
+            elif part:
+                print(f"Sign lexicon not found at {part}, skipping it")
+        if not lexicon.spells:
+            print(f"No letter signs in the lexicon ({len(lexicon.signs)} signs), "
+                  f"assuming {SIGN_SECONDS:.0f}s for each word it doesn't have")
+        return lexicon
+
+    def word_signs(self, word):
+        """SiGML documents the avatar plays for `word`, in order"""
+        # Same lookup as the avatar: the lowercased word as-is, otherwise
+        # one sign per character that has one
+        word = word.lower()
+        if word in self.signs:
+            return [self.signs[word]]
+        return [self.signs[char] for char in word if char in self.signs]
+
+    def word_seconds(self, word):
+        word = word.lower()
+        if word in self.seconds:
+            return self.seconds[word]
+        if not self.spells:
+            # Nothing to fingerspell with, so we can't tell
+            return SIGN_SECONDS
+        return sum(self.seconds[char] for char in word if char in self.seconds)
+
+    def text_seconds(self, text):
+        return sum(self.word_seconds(word) for word in text.split())
+
+    def condense(self, words, seconds):
+        """The words of `words` to sign so that signing takes at most `seconds`.
+
+        The costliest words (usually long fingerspellings) are dropped first,
+        later words first on ties; the rest keep their order. For a fixed
+        list of words the result only changes when `seconds` crosses the
+        total cost of some set of dropped words, so condensing again with
+        the window's own duration gives back the same words.
+        """
+        dropped = self.overflow(words, seconds)
+        return [word for index, word in enumerate(words) if index not in dropped]
+
+    def overflow(self, words, seconds):
+        """Indexes of the words condense() leaves out"""
+        costs = [self.word_seconds(word) for word in words]
+        total = sum(costs)
+        dropped = set()
+        for index in sorted(range(len(words)), key=lambda i: (-costs[i], -i)):
+            if total <= seconds + 1e-6:
+                break
+            dropped.add(index)
+            total -= costs[index]
+        return dropped
+
+
+def _timed_words(transcript):
+    """Yield (start, end, word) with each segment's words spread over its speaking time.
+
+    Auto-captions overlap, so a segment is treated as ending when the next one
+    starts. Bracketed non-speech annotations like [Music] are dropped.
+    """
+    count = len(transcript)
+    for index in range(count):
+        start = transcript.starts[index]
+        end = transcript.end(index)
+        if index + 1 < count:
+            end = min(end, transcript.starts[index + 1])
+        words = NON_SPEECH.sub(' ', transcript.text(index)).split()
+        if not words:
+            continue
+        step = max(end - start, 0.0) / len(words)
+        for position, word in enumerate(words):
+            yield start + position * step, start + (position + 1) * step, word
+
+
+def rechunk(transcript, lexicon, min_seconds=MIN_WINDOW_SECONDS, max_seconds=MAX_WINDOW_SECONDS,
+            gap_seconds=GAP_SECONDS, max_lag=None):
+    """Merge, split and realign transcript segments into windows the avatar can finish.
+
+    Single pass over the words of `transcript` (a CompactTranscript).
+    Windows follow the speech: one closes at a sentence end once it covers
+    `min_seconds`, before it would cover more than `max_seconds`, or at a
+    silence of `gap_seconds`.
+
+    A window starts when its speech does, or when the avatar finishes the
+    previous window if that is later, and lasts long enough to sign every
+    one of its words. When signing falls behind the video, later windows
+    shift later, and a window whose speech is over before the avatar is
+    free keeps taking words (up to `max_seconds` of signing), so a backlog
+    goes out as a few larger messages instead of many small ones.
+
+    `max_lag` (off by default) caps how far a window may end after its
+    speech. Words that don't fit are left out of its signing as in
+    SignLexicon.condense() and listed under the window's 'dropped' key;
+    its text keeps all of them for captions.
+
+    Returns a list of {'start', 'duration', 'text'} segments.
+    """
+    windows = []
+    words = []
+    first_time = last_end = 0.0
+    signing = 0.0
+    free_at = 0.0
+
+    def flush():
+        nonlocal free_at
+        start = max(first_time, free_at)
+        window = {'start': start, 'text': ' '.join(words)}
+        seconds = signing
+        if max_lag is not None:
+            dropped = sorted(lexicon.overflow(words, last_end + max_lag - start))
+            if dropped:
+                window['dropped'] = [words[index] for index in dropped]
+                seconds -= sum(lexicon.word_seconds(word) for word in window['dropped'])
+        window['duration'] = max(seconds, last_end - start)
+        windows.append(window)
+        free_at = start + window['duration']
+
+    for time, end, word in _timed_words(transcript):
+        cost = lexicon.word_seconds(word)
+        # Speech already over when the avatar gets to it can't be signed on
+        # time whatever we do, so while there's room keep it in this window
+        merging = end <= free_at and signing + cost <= max_seconds
+        if words and not merging and (time - last_end > gap_seconds or end - first_time > max_seconds):
+            flush()
+            words = []
+        if not words:
+            first_time = time
+            signing = 0.0
+        words.append(word)
+        signing += cost
+        last_end = end
+        if not merging and end - first_time >= min_seconds and SENTENCE_END.search(word):
+            flush()
+            words = []
+
+    if words:
+        flush()
+    return windows
+
+
+def build_schedule(transcript, lexicon, max_lag=None):
+    """Precompute the avatar playback schedule for a transcript.
+
+    With `max_lag`, reports the words the lag cap leaves unsigned.
+    """
+    windows = rechunk(transcript, lexicon, max_lag=max_lag)
+    dropped = [word for window in windows for word in window.get('dropped', ())]
+    if dropped:
+        total = sum(len(window['text'].split()) for window in windows)
+        print(f"Lag cap of {max_lag}s leaves {len(dropped)} of {total} words unsigned: {' '.join(dropped)}")
+    return CompactTranscript.from_segments(windows)
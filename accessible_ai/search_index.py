@@ -0,0 +1,180 @@
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    start REAL NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_video ON segments (video_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5 (
+    text,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# bm25 ranking scores every match before the LIMIT applies, so a query
+# ranks at most this many of its matches, the most recently indexed ones
+RANK_CANDIDATES = 1000
+
+# A quoted phrase or a single bare term
+QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def build_match_query(query):
+    """Turn user input into an FTS5 MATCH expression.
+
+    Text in double quotes is matched as a phrase; every other word is
+    matched as a literal term, so FTS5 operators in user input are inert.
+    All parts must match.
+    """
+    parts = []
+    for phrase, term in QUERY_TOKEN.findall(query):
+        text = (phrase or term).strip()
+        if text:
+            parts.append('"' + text.replace('"', '""') + '"')
+    return ' '.join(parts)
+
+
+class TranscriptIndex:
+    """Full-text index over saved transcripts, mapping terms to (video_id, start).
+
+    Each video's segments are replaced wholesale when it is re-added, so the
+    index can be kept up to date incrementally as transcripts are saved.
+    The database is opened, and created if need be, on first use.
+    """
+
+    def __init__(self, path, rank_candidates=RANK_CANDIDATES):
+        self.path = path
+        self.rank_candidates = rank_candidates
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._created = False
+
+    def _connect(self):
+        # sqlite3 connections are not shareable across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            if not self._created:
+                with self._write_lock:
+                    conn.executescript(SCHEMA)
+                self._created = True
+            self._local.conn = conn
+        return conn
+
+    def add_transcript(self, video_id, segments, mtime=0.0):
+        """Index (or re-index) all segments of one video"""
+        conn = self._connect()
+        with self._write_lock, conn:
+            self._remove(conn, video_id)
+            for segment in segments:
+                cursor = conn.execute(
+                    'INSERT INTO segments (video_id, start, duration) VALUES (?, ?, ?)',
+                    (video_id, segment['start'], segment['duration']),
+                )
+                conn.execute(
+                    'INSERT INTO segments_fts (rowid, text) VALUES (?, ?)',
+                    (cursor.lastrowid, segment['text']),
+                )
+            conn.execute(
+                'INSERT OR REPLACE INTO videos (video_id, mtime) VALUES (?, ?)',
+                (video_id, mtime),
+            )
+
+    def remove_transcript(self, video_id):
+        conn = self._connect()
+        with self._write_lock, conn:
+            self._remove(conn, video_id)
+
+    def _remove(self, conn, video_id):
+        conn.execute(
+            'DELETE FROM segments_fts WHERE rowid IN '
+            '(SELECT id FROM segments WHERE video_id = ?)',
+            (video_id,),
+        )
+        conn.execute('DELETE FROM segments WHERE video_id = ?', (video_id,))
+        conn.execute('DELETE FROM videos WHERE video_id = ?', (video_id,))
+
+    def ingest_directory(self, directory):
+        """Sync the index with the <video_id>.json files in `directory`.
+
+        Transcripts that are new or changed since the last run are
+        (re)indexed and videos whose file has been deleted are removed.
+        Returns the number of transcripts indexed or removed.
+        """
+        known = dict(self._connect().execute('SELECT video_id, mtime FROM videos'))
+        count = 0
+        for filename in sorted(glob.glob(os.path.join(directory, '*.json'))):
+            video_id = os.path.splitext(os.path.basename(filename))[0]
+            mtime = os.path.getmtime(filename)
+            if known.pop(video_id, None) == mtime:
+                continue
+            try:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    segments = json.load(f)
+                self.add_transcript(video_id, segments, mtime)
+                count += 1
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Skipping {filename}: {e}")
+            # Let other threads run between files. Under gevent this keeps a
+            # long first sync from stalling the worker; sleep(0) would not
+            # let the event loop run its timers and I/O.
+            time.sleep(0.001)
+        # Whatever is left in `known` no longer has a file
+        for video_id in known:
+            self.remove_transcript(video_id)
+            count += 1
+        return count
+
+    def search(self, query, limit=20, video_id=None):
+        """Return the best-matching segments as dicts with video_id, start, duration, text.
+
+        Only the `rank_candidates` most recently indexed matches are ranked,
+        which is exact for all but very common terms and keeps those fast.
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        conn = self._connect()
+        where, where_params = 'segments_fts MATCH ?', [match]
+        join, join_params = '', []
+        if video_id:
+            # A video's segments are added in one transaction, so their ids
+            # form a range FTS5 can seek to; the join still checks the video
+            first, last = conn.execute(
+                'SELECT min(id), max(id) FROM segments WHERE video_id = ?', (video_id,)
+            ).fetchone()
+            if first is None:
+                return []
+            where += ' AND rowid BETWEEN ? AND ?'
+            where_params += [first, last]
+            join, join_params = ' AND s.video_id = ?', [video_id]
+        sql = (
+            'SELECT s.video_id, s.start, s.duration, c.text FROM ('
+            f'SELECT rowid, text, rank FROM segments_fts WHERE {where} ORDER BY rowid DESC LIMIT ?'
+            f') c JOIN segments s ON s.id = c.rowid{join} '
+            'ORDER BY c.rank LIMIT ?'
+        )
+        params = where_params + [self.rank_candidates] + join_params + [limit]
+        rows = conn.execute(sql, params).fetchall()
+        return [
+            {'video_id': vid, 'start': start, 'duration': duration, 'text': text}
+            for vid, start, duration, text in rows
+        ]
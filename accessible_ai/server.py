@@ -0,0 +1,235 @@
+from flask import Flask, Response, request, jsonify
+from flask_cors import CORS
+import json
+import threading
+
+from .compact_transcript import CompactTranscript, TranscriptCache
+from .config import index_path, load_config, transcript_languages
+from .playback import SessionRegistry
+from .rechunk import SignLexicon, build_schedule
+from .search_index import TranscriptIndex
+from .transcripts import download_transcript, save_transcript_to_file
+
+config = load_config()
+
+app = Flask(__name__)
+CORS(app)
+
+# Recently fetched transcripts, shared by requests and playback sessions
+transcript_cache = TranscriptCache()
+
+# The avatar's sign lexicon and the schedules paced by it
+sign_lexicon = SignLexicon.load(config['LEXICON_PATH'])
+schedule_cache = TranscriptCache()
+
+# Live playback sessions for the server-pushed caption stream
+sessions = SessionRegistry()
+
+# Full-text index over everything in the transcripts directory. It is
+# opened on first use and synced in the background (start_index_sync), so
+# importing the app stays fast however many transcripts there are.
+search_index = TranscriptIndex(index_path(config))
+index_sync = None
+
+def sync_index():
+    count = search_index.ingest_directory(config['TRANSCRIPTS_DIR'])
+    print(f"Search index: {count} transcripts indexed or removed")
+
+# Runs however the app is served (CLI, gunicorn); searches made before the
+# sync finishes only miss transcripts saved while the server was down
+@app.before_first_request
+def start_index_sync():
+    """Pick up transcripts saved while the server was down, in a background thread.
+
+    Only the first call starts the sync; every call returns its thread.
+    """
+    global index_sync
+    if index_sync is None:
+        index_sync = threading.Thread(target=sync_index, name='index-sync', daemon=True)
+        index_sync.start()
+    return index_sync
+
+def fetch_transcript(video_id):
+    """Fetch a transcript from YouTube, map it for signing and save it to disk.
+
+    Returns a CompactTranscript; repeat requests for the same video are
+    served from transcript_cache.
+    """
+    cached = transcript_cache.get(video_id)
+    if cached is not None:
+        return cached
+
+    transcript = download_transcript(video_id, transcript_languages(config))
+    
+    # Save transcript to file
+    save_transcript_to_file(video_id, transcript, config['TRANSCRIPTS_DIR'], search_index)
+    
+    print(f"Successfully processed transcript with {len(transcript)} segments")
+    compact = CompactTranscript.from_segments(transcript)
+    transcript_cache.put(video_id, compact)
+    return compact
+
+def fetch_schedule(video_id):
+    """Avatar playback schedule for a video: its transcript re-chunked to signing pace"""
+    schedule = schedule_cache.get(video_id)
+    if schedule is None:
+        transcript = fetch_transcript(video_id)
+        schedule = build_schedule(transcript, sign_lexicon, config['MAX_SIGN_LAG'] or None)
+        print(f"Built schedule for {video_id}: {len(transcript)} segments -> {len(schedule)} windows")
+        schedule_cache.put(video_id, schedule)
+    return schedule
+
+def window_payload(index, window):
+    """A schedule window plus the words the avatar has time to sign in it"""
+    # The avatar page looks the words up in its own lexicon, so only the
+    # words are sent, not their SiGML
+    signed = sign_lexicon.condense(window['text'].split(), window['duration'])
+    return dict(window, index=index, sign_text=' '.join(signed))
+
+@app.route('/api/transcript', methods=['POST'])
+def get_transcript():
+    data = request.json
+    video_id = data.get("id")
+    if not video_id:
+        return jsonify({"error": "YouTube video ID missing"}), 400
+
+    try:
+        transcript = fetch_transcript(video_id)
+        return Response(transcript.to_json(), mimetype='application/json')
+    except Exception as e:
+        error_msg = str(e)
+        print(f"Error fetching transcript: {error_msg}")
+        return jsonify({"error": error_msg}), 500
+
+@app.route('/api/schedule', methods=['POST'])
+def get_schedule():
+    """Like /api/transcript, but chunked into windows the avatar can finish.
+
+    Each window also has its index and `sign_text`, the part of its text
+    the avatar signs within the window.
+    """
+    data = request.json
+    video_id = data.get("id")
+    if not video_id:
+        return jsonify({"error": "YouTube video ID missing"}), 400
+
+    try:
+        schedule = fetch_schedule(video_id)
+        return jsonify([window_payload(index, window) for index, window in enumerate(schedule)])
+    except Exception as e:
+        error_msg = str(e)
+        print(f"Error building schedule: {error_msg}")
+        return jsonify({"error": error_msg}), 500
+
+@app.route('/api/session', methods=['POST'])
+def create_session():
+    """Start a playback session; segments are then pushed over /stream"""
+    data = request.json
+    video_id = data.get("id")
+    if not video_id:
+        return jsonify({"error": "YouTube video ID missing"}), 400
+
+    try:
+        schedule = fetch_schedule(video_id)
+    except Exception as e:
+        error_msg = str(e)
+        print(f"Error fetching transcript: {error_msg}")
+        return jsonify({"error": error_msg}), 500
+
+    # Opportunistically drop sessions whose clients went away
+    sessions.expire()
+    session = sessions.create(video_id, schedule)
+    print(f"Started playback session {session.session_id} for {video_id} ({len(sessions)} active)")
+    return jsonify({"session": session.session_id, "segments": len(schedule)}), 201
+
+@app.route('/api/session/<session_id>/clock', methods=['POST'])
+def update_session_clock(session_id):
+    """Receive a playback clock event: play, pause, seek or rate"""
+    session = sessions.get(session_id)
+    if not session:
+        return jsonify({"error": "Unknown session"}), 404
+
+    data = request.json or {}
+    event = data.get("event")
+    if event not in ('play', 'pause', 'seek', 'rate'):
+        return jsonify({"error": "event must be one of play, pause, seek, rate"}), 400
+
+    try:
+        position = data.get("position")
+        rate = data.get("rate")
+        session.update(
+            event,
+            None if position is None else float(position),
+            None if rate is None else float(rate),
+        )
+    except (TypeError, ValueError):
+        return jsonify({"error": "position and rate must be numbers"}), 400
+    return '', 204
+
+@app.route('/api/session/<session_id>/stream', methods=['GET'])
+def stream_session(session_id):
+    """Server-sent event stream of segments, each pushed just before it starts"""
+    session = sessions.get(session_id)
+    if not session:
+        return jsonify({"error": "Unknown session"}), 404
+
+    # A reconnecting client replaces whatever stream it left behind
+    stream = session.attach()
+
+    def events():
+        yield f"event: ready\ndata: {json.dumps({'session': session.session_id})}\n\n"
+        while True:
+            due = session.wait_for_due(stream)
+            if due is None:
+                return
+            if not due:
+                # Comment line keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            for index, segment in due:
+                payload = window_payload(index, segment)
+                yield f"event: segment\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(events(), mimetype='text/event-stream', headers=headers)
+
+@app.route('/api/session/<session_id>', methods=['DELETE'])
+def end_session(session_id):
+    if not sessions.drop(session_id):
+        return jsonify({"error": "Unknown session"}), 404
+    return '', 204
+
+@app.route('/api/search', methods=['GET'])
+def search_transcripts():
+    """Search saved transcripts; wrap words in double quotes for a phrase query"""
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Search query missing"}), 400
+
+    try:
+        limit = min(max(int(request.args.get("limit", 20)), 1), 200)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    try:
+        hits = search_index.search(query, limit=limit, video_id=request.args.get("video"))
+    except Exception as e:
+        error_msg = str(e)
+        print(f"Error searching transcripts: {error_msg}")
+        return jsonify({"error": error_msg}), 500
+    return jsonify({"query": query, "hits": hits})
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check endpoint to verify the API is running"""
+    return jsonify({"status": "ok", "message": "API is running"}), 200
+
+def run(host=None, port=None, debug=None):
+    """Serve the API with Flask's development server"""
+    print("Starting YouTube Transcript API Server...")
+    app.run(
+        host=config['HOST'] if host is None else host,
+        port=config['PORT'] if port is None else port,
+        debug=config['DEBUG'] if debug is None else debug,
+        threaded=True,
+    )
@@ -1,18 +1,19 @@
 # To run this code you need to install the following dependencies:
 # pip install google-genai
 
-import base64
-import os
-from google import genai
-from google.genai import types
 
+def generate(prompt, api_key, model="gemini-2.0-flash"):
+    """Ask Gemini for SiGML, primed with a conversation of example signs; returns the reply"""
+    # google.genai is slow to import, so only pay for it when generating
+    from google import genai
+    from google.genai import types
 
-def generate():
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY is not set")
     client = genai.Client(
-        api_key=os.environ.get("GEMINI_API_KEY"),
+        api_key=api_key,
     )
 
-    model = "gemini-2.0-flash"
     contents = [
         types.Content(
             role="user",
@@ -475,7 +476,7 @@ By carefully adjusting the parameters and adding facial expressions, you should
         types.Content(
             role="user",
             parts=[
-                types.Part.from_text(text="""INSERT_INPUT_HERE"""),
+                types.Part.from_text(text=prompt),
             ],
         ),
     ]
@@ -483,12 +484,14 @@ By carefully adjusting the parameters and adding facial expressions, you should
         response_mime_type="text/plain",
     )
 
+    reply = []
     for chunk in client.models.generate_content_stream(
         model=model,
         contents=contents,
         config=generate_content_config,
     ):
-        print(chunk.text, end="")
-
-if __name__ == "__main__":
-    generate()
+        text = chunk.text or ""
+        print(text, end="")
+        reply.append(text)
+    print()
+    return "".join(reply)
@@ -0,0 +1,58 @@
+import json
+import os
+
+def create_semantic_map(text):
+    # This is a placeholder function that would be implemented later
+    # to transform the transcript text into semantic representations for sign language
+    # For now, just return the original text
+    return text
+
+def download_transcript(video_id, languages):
+    """Fetch a transcript from YouTube and map each segment for signing"""
+    # Imported here so commands that never hit YouTube don't pay for it
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    print(f"Fetching transcript for video ID: {video_id}")
+    transcript = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
+    
+    for segment in transcript:
+        segment['text'] = create_semantic_map(segment['text'])
+    return transcript
+
+def format_timeline(segment):
+    """Format: [15.3s - 18.2s] Text of the segment"""
+    start_time = segment['start']
+    end_time = start_time + segment['duration']
+    return f"[{start_time:.1f}s - {end_time:.1f}s] {segment['text']}"
+
+def save_transcript_to_file(video_id, transcript_data, directory, index=None):
+    """Save transcript data to video_id.txt and video_id.json, and add it to `index` if given"""
+    try:
+        # Create transcripts directory if it doesn't exist
+        os.makedirs(directory, exist_ok=True)
+        
+        filename = os.path.join(directory, f"{video_id}.txt")
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            # First write a simple header
+            f.write(f"Transcript for YouTube video: {video_id}\n")
+            f.write("-" * 50 + "\n\n")
+            
+            # Write each segment with timeline
+            for segment in transcript_data:
+                f.write(format_timeline(segment) + "\n")
+        
+        # Also save as JSON for easier processing if needed
+        json_filename = os.path.join(directory, f"{video_id}.json")
+        with open(json_filename, 'w', encoding='utf-8') as f:
+            json.dump(transcript_data, f, ensure_ascii=False, indent=2)
+        
+        # Keep the search index in step with the saved file
+        if index is not None:
+            index.add_transcript(video_id, transcript_data, os.path.getmtime(json_filename))
+        
+        print(f"Transcript saved to {filename} and {json_filename}")
+        return True
+    except Exception as e:
+        print(f"Error saving transcript: {e}")
+        return False
@@ -7,9 +7,14 @@ let syncInterval = null;
 let isVideoPlaying = false;
 let lastVideoTime = 0;
 let avatarWindow = null;
+let playbackSessionId = null;
+let segmentStream = null;
+let pendingSegmentTimer = null;
+let pushedSegments = []; // pushed by the server, not shown yet, in start order
 
 // Backend API URL
-const API_URL = 'http://localhost:5000/api/transcript';
+const API_URL = 'http://localhost:5000/api/schedule';
+const SESSION_API_URL = 'http://localhost:5000/api/session';
 
 // Avatar URL
 const AVATAR_URL = 'http://localhost:8000/work/avatarnew.html';
@@ -241,6 +246,137 @@ async function fetchTranscript(videoId) {
   }
 }
 
+// Tell the server about a play/pause/seek/rate change so it can reschedule pushes
+function sendClockEvent(event) {
+  const video = document.querySelector('video');
+  if (!playbackSessionId || !video) return;
+
+  fetch(`${SESSION_API_URL}/${playbackSessionId}/clock`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({
+      event,
+      position: video.currentTime,
+      rate: video.playbackRate,
+    }),
+  }).catch(error => console.error('Failed to send clock event:', error));
+}
+
+// Queue a pushed segment until playback reaches its start time
+function handlePushedSegment(segment) {
+  // The server re-sends the on-screen segment after a reconnect
+  if (pushedSegments.some(queued => queued.index === segment.index)) return;
+
+  pushedSegments.push(segment);
+  pushedSegments.sort((a, b) => a.start - b.start);
+  armSegmentTimer();
+}
+
+// Wake up when the first queued segment is due; nothing is armed while paused
+function armSegmentTimer() {
+  if (pendingSegmentTimer) {
+    clearTimeout(pendingSegmentTimer);
+    pendingSegmentTimer = null;
+  }
+
+  const video = document.querySelector('video');
+  if (!video || video.paused || pushedSegments.length === 0) return;
+
+  // The server pushes slightly ahead of the start time
+  const delay = Math.max(0, (pushedSegments[0].start - video.currentTime) / (video.playbackRate || 1));
+  pendingSegmentTimer = setTimeout(showDueSegment, delay * 1000);
+}
+
+// Show the latest queued segment that playback has reached
+function showDueSegment() {
+  pendingSegmentTimer = null;
+  const video = document.querySelector('video');
+  if (!video || video.paused) return; // re-armed on play
+
+  if (!isMainVideoPlaying()) {
+    // Ad or buffering: keep the queue and look again shortly
+    pendingSegmentTimer = setTimeout(showDueSegment, 500);
+    return;
+  }
+
+  let due = null;
+  while (pushedSegments.length > 0 && pushedSegments[0].start <= video.currentTime + 0.05) {
+    due = pushedSegments.shift();
+  }
+  if (due && due.index !== currentSegmentIndex) {
+    currentSegmentIndex = due.index;
+    updateCaption(due, due.index);
+  }
+  armSegmentTimer();
+}
+
+// Open a server-pushed segment stream for the video; returns false if unavailable
+async function startPlaybackSession(videoId) {
+  try {
+    const response = await fetch(SESSION_API_URL, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ id: videoId }),
+    });
+
+    if (!response.ok) {
+      throw new Error(`Server responded with status: ${response.status}`);
+    }
+
+    const data = await response.json();
+    if (!data.segments) {
+      return false;
+    }
+
+    playbackSessionId = data.session;
+    segmentStream = new EventSource(`${SESSION_API_URL}/${playbackSessionId}/stream`);
+    segmentStream.addEventListener('segment', (event) => {
+      handlePushedSegment(JSON.parse(event.data));
+    });
+    segmentStream.onerror = (error) => {
+      console.error('Segment stream error:', error);
+    };
+
+    // Sync the server clock with wherever the video is right now
+    const video = document.querySelector('video');
+    sendClockEvent('seek');
+    if (video && !video.paused) {
+      sendClockEvent('play');
+    }
+
+    console.log(`Playback session ${playbackSessionId} started with ${data.segments} segments`);
+    return true;
+
+  } catch (error) {
+    console.error('Failed to start playback session:', error);
+    return false;
+  }
+}
+
+// Close the segment stream and end the server session
+function stopPlaybackSession() {
+  if (pendingSegmentTimer) {
+    clearTimeout(pendingSegmentTimer);
+    pendingSegmentTimer = null;
+  }
+  pushedSegments = [];
+
+  if (segmentStream) {
+    segmentStream.close();
+    segmentStream = null;
+  }
+
+  if (playbackSessionId) {
+    fetch(`${SESSION_API_URL}/${playbackSessionId}`, { method: 'DELETE' })
+      .catch(() => {});
+    playbackSessionId = null;
+  }
+}
+
 // Find the segment that matches the current video time
 function findSegmentForTime(currentTime) {
   if (!transcriptData) return null;
@@ -272,8 +408,11 @@ function updateCaption(segment, segmentIndex) {
       const endTime = Math.floor(segment.start + segment.duration);
       timestampDisplay.textContent = `[${startTime}s-${endTime}s]`;
       
-      // Send text to avatar
-      sendTextToAvatar(segment.text);
+      // Send text to avatar; schedule windows say which words fit
+      const signText = segment.sign_text ?? segment.text;
+      if (signText) {
+        sendTextToAvatar(signText);
+      }
     } else {
       captionDisplay.textContent = 'No caption for this time';
       captionDisplay.style.color = '#888';
@@ -391,11 +530,18 @@ async function initializeTranscript() {
       clearInterval(syncInterval);
       syncInterval = null;
     }
+    stopPlaybackSession();
     
     // Show loading status
     updateVideoStatus('📥 Loading transcript...');
     
-    // Fetch new transcript
+    // Prefer segments pushed by the server on the playback clock
+    if (await startPlaybackSession(videoId)) {
+      updateVideoStatus('✅ Ready');
+      return;
+    }
+    
+    // Fall back to fetching the whole transcript and polling
     const data = await fetchTranscript(videoId);
     if (data && data.length > 0) {
       transcriptData = data;
@@ -430,6 +576,7 @@ function handlePageChange() {
       clearInterval(syncInterval);
       syncInterval = null;
     }
+    stopPlaybackSession();
     
     // Close avatar window
     if (avatarWindow && !avatarWindow.closed) {
@@ -475,19 +622,35 @@ function initialize() {
       video.addEventListener('play', () => {
         console.log('Video play event');
         isVideoPlaying = true;
+        sendClockEvent('play');
+        armSegmentTimer();
       });
       
       video.addEventListener('pause', () => {
         console.log('Video pause event');
         isVideoPlaying = false;
+        sendClockEvent('pause');
+        armSegmentTimer();
       });
       
       video.addEventListener('seeked', () => {
         console.log('Video seeked event');
+        if (playbackSessionId) {
+          // The server re-sends from the new position
+          pushedSegments = [];
+          currentSegmentIndex = -1;
+          armSegmentTimer();
+        }
+        sendClockEvent('seek');
         // Force immediate sync after seeking
         setTimeout(syncWithVideo, 100);
       });
       
+      video.addEventListener('ratechange', () => {
+        sendClockEvent('rate');
+        armSegmentTimer();
+      });
+      
       video.addEventListener('timeupdate', () => {
         // This fires frequently during playback
         lastVideoTime = video.currentTime;
@@ -531,6 +694,7 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
       clearInterval(syncInterval);
       syncInterval = null;
     }
+    stopPlaybackSession();
     
     transcriptData = null;
     currentVideoId = null;
@@ -550,6 +714,7 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
 
 // Handle page unload to close avatar window
 window.addEventListener('beforeunload', () => {
+  stopPlaybackSession();
   if (avatarWindow && !avatarWindow.closed) {
     avatarWindow.close();
   }
@@ -0,0 +1,15 @@
+# Settings for `gunicorn app:app`, read from the working directory.
+#
+# Playback sessions live in the server process, so everything must run in
+# one worker. The gevent worker makes that one worker enough: a segment
+# stream spends nearly all its time waiting for its next segment, and each
+# waiting stream costs a greenlet instead of a thread.
+from accessible_ai.config import load_config
+
+# Not named `config`: gunicorn reads every module-level name as a setting
+_config = load_config()
+
+bind = f"{_config['HOST']}:{_config['PORT']}"
+workers = 1
+worker_class = 'gevent'
+worker_connections = 10000
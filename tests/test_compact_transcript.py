@@ -0,0 +1,51 @@
+import json
+
+from accessible_ai.compact_transcript import CompactTranscript, TranscriptCache
+
+SEGMENTS = [
+    {'start': i * 1.5, 'duration': 2.0, 'text': f"segment {i} ünïcode"}
+    for i in range(20)
+]
+
+
+def test_round_trips_as_list_and_json():
+    transcript = CompactTranscript.from_segments(SEGMENTS)
+    assert transcript.to_list() == SEGMENTS
+    assert json.loads(transcript.to_json()) == SEGMENTS
+
+
+def test_slices_share_buffers_and_serialize():
+    transcript = CompactTranscript.from_segments(SEGMENTS)
+    window = transcript[5:10]
+    assert window.to_list() == SEGMENTS[5:10]
+    assert window[-1] == SEGMENTS[9]
+    assert CompactTranscript.from_bytes(window.to_bytes()).to_list() == SEGMENTS[5:10]
+
+
+def test_empty_slice_serializes_empty():
+    transcript = CompactTranscript.from_segments(SEGMENTS)
+    for empty in (transcript[5:5], transcript.between(100.0, 200.0)):
+        data = empty.to_bytes()
+        loaded = CompactTranscript.from_bytes(data)
+        assert len(loaded) == 0
+        assert loaded.to_list() == []
+        assert empty.nbytes == loaded.nbytes
+        # Header plus a single zero offset, no arena
+        assert len(data) == 12 + 4
+
+
+def test_time_lookups():
+    transcript = CompactTranscript.from_segments(SEGMENTS)
+    assert transcript.between(3.0, 6.0).to_list() == SEGMENTS[2:4]
+    assert transcript.index_at(4.6) == 3
+    assert transcript.index_at(-1.0) == -1
+
+
+def test_cache_evicts_by_bytes():
+    transcript = CompactTranscript.from_segments(SEGMENTS)
+    cache = TranscriptCache(max_bytes=transcript.nbytes * 2)
+    for video_id in ('a', 'b', 'c'):
+        cache.put(video_id, transcript)
+    assert len(cache) == 2
+    assert cache.get('a') is None
+    assert cache.get('c') is transcript
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from accessible_ai import cli
+from accessible_ai.config import CONFIG_ENV, DEFAULTS, ConfigError, env_name, index_path, load_config
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    monkeypatch.delenv(CONFIG_ENV, raising=False)
+    for key in DEFAULTS:
+        monkeypatch.delenv(env_name(key), raising=False)
+
+
+def test_defaults():
+    assert load_config() == DEFAULTS
+    assert index_path(DEFAULTS) == os.path.join('transcripts', 'index.db')
+
+
+def test_only_prefixed_environment_is_read(monkeypatch):
+    monkeypatch.setenv('DEBUG', '1')
+    monkeypatch.setenv('PORT', 'x')
+    monkeypatch.setenv('ACCESSIBLE_AI_PORT', '8080')
+    monkeypatch.setenv('GEMINI_API_KEY', 'key')
+    config = load_config()
+    assert config['DEBUG'] is False
+    assert config['PORT'] == 8080
+    assert config['GEMINI_API_KEY'] == 'key'
+
+
+def test_environment_overrides_file(tmp_path, monkeypatch):
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({'PORT': 6000, 'DEBUG': True}))
+    monkeypatch.setenv('ACCESSIBLE_AI_DEBUG', 'no')
+    config = load_config(str(path))
+    assert config['PORT'] == 6000
+    assert config['DEBUG'] is False
+
+
+@pytest.mark.parametrize('name, value', [
+    ('ACCESSIBLE_AI_PORT', 'x'), ('ACCESSIBLE_AI_DEBUG', 'maybe'), ('ACCESSIBLE_AI_MAX_SIGN_LAG', 'soon'),
+])
+def test_bad_environment_value(monkeypatch, name, value):
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ConfigError, match=name):
+        load_config()
+
+
+def test_bad_file(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({'PROT': 1}))
+    with pytest.raises(ConfigError, match='unknown setting PROT'):
+        load_config(str(path))
+    with pytest.raises(ConfigError, match="can't read"):
+        load_config(str(tmp_path / 'missing.json'))
+
+
+def test_cli_reports_bad_config_cleanly(monkeypatch, capsys):
+    monkeypatch.setenv('ACCESSIBLE_AI_PORT', 'x')
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['validate', 'customize_option/salute.sigml'])
+    assert exit_info.value.code == 2
+    assert 'ACCESSIBLE_AI_PORT: expected an integer' in capsys.readouterr().err
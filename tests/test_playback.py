@@ -0,0 +1,74 @@
+import threading
+
+from accessible_ai.compact_transcript import CompactTranscript
+from accessible_ai.playback import PlaybackClock, PlaybackSession
+
+
+def short_transcript():
+    return CompactTranscript.from_segments([
+        {'start': 0.0, 'duration': 0.2, 'text': 'one'},
+        {'start': 0.2, 'duration': 0.2, 'text': 'two'},
+        {'start': 0.4, 'duration': 0.2, 'text': 'three'},
+    ])
+
+
+def drain(session, stream, count):
+    indexes = []
+    while len(indexes) < count:
+        due = session.wait_for_due(stream, keepalive=1.0)
+        assert due is not None
+        indexes += [index for index, _ in due]
+    return indexes
+
+
+def test_clock_follows_play_pause_and_rate():
+    clock = PlaybackClock(now=0.0)
+    clock.update('play', 10.0, now=0.0)
+    assert clock.position_at(2.0) == 12.0
+    clock.update('rate', rate=2.0, now=2.0)
+    assert clock.seconds_until(16.0, 2.0) == 2.0
+    clock.update('pause', now=3.0)
+    assert clock.position_at(100.0) == 14.0
+    assert clock.seconds_until(20.0, 100.0) is None
+
+
+def test_new_stream_replaces_the_old_one():
+    session = PlaybackSession('vid', short_transcript(), lead=0.0)
+    old = session.attach()
+    assert drain(session, old, 1) == [0]
+    results = []
+    reader = threading.Thread(target=lambda: results.append(session.wait_for_due(old, keepalive=5.0)))
+    reader.start()
+
+    new = session.attach()
+    reader.join(1.0)
+    assert not reader.is_alive()
+    assert results == [None]
+    assert session.wait_for_due(old) is None
+
+    session.update('play', 0.0)
+    assert drain(session, new, 3) == [0, 1, 2]
+    session.close()
+    assert session.wait_for_due(new) is None
+
+
+def test_attach_rearms_segments_an_old_stream_took():
+    session = PlaybackSession('vid', short_transcript(), lead=0.0)
+    old = session.attach()
+    assert [index for index, _ in session.wait_for_due(old)] == [0]
+    new = session.attach()
+    assert [index for index, _ in session.wait_for_due(new)] == [0]
+
+
+def test_paused_session_waits_and_seek_reschedules():
+    session = PlaybackSession('vid', short_transcript(), lead=0.0)
+    stream = session.attach()
+    assert drain(session, stream, 1) == [0]
+    # Paused: nothing else comes due, the wait ends on the keepalive
+    assert session.wait_for_due(stream, keepalive=0.05) == []
+
+    session.update('seek', 0.3)
+    # Still on screen at 0.3, so pushed again right away
+    assert [index for index, _ in session.wait_for_due(stream, keepalive=0.05)] == [1]
+    session.update('play')
+    assert drain(session, stream, 1) == [2]
@@ -0,0 +1,132 @@
+import json
+import random
+import string
+
+from accessible_ai.compact_transcript import CompactTranscript
+from accessible_ai.rechunk import SIGN_SECONDS, SignLexicon, build_schedule, estimate_sigml_seconds, rechunk
+
+WORDS = ['the', 'quick', 'brown', 'fox', 'jumps', 'over', 'lazy', 'dog', 'hello', 'world',
+         'sign', 'language', 'avatar', 'video', 'today', 'we', 'are', 'going', 'to', 'learn']
+
+
+def sign(gloss, moves=0):
+    movement = '<hammoveu/>' * moves
+    return (f'<sigml><hns_sign gloss="{gloss}"><hamnosys_manual><hamflathand/>{movement}'
+            '</hamnosys_manual></hns_sign></sigml>')
+
+
+def avatar_lexicon():
+    # Like the avatar's sigmlData.json: every letter plus some words
+    lexicon = SignLexicon()
+    for char in string.ascii_lowercase:
+        lexicon.add(char, sign(char))
+    for moves, word in enumerate(('hello', 'world', 'sign', 'language', 'the', 'we', 'are', 'to')):
+        lexicon.add(word, sign(word, moves % 4))
+    return lexicon
+
+
+def auto_captions(count=300, seed=7):
+    # YouTube auto-caption shape: ~2 s segments, overlapping, no punctuation
+    rng = random.Random(seed)
+    segments = []
+    for index in range(count):
+        text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 7)))
+        segments.append({'start': index * 2.0, 'duration': 3.0, 'text': text})
+    return CompactTranscript.from_segments(segments)
+
+
+def test_pacing_uses_each_gloss_estimate():
+    lexicon = avatar_lexicon()
+    assert estimate_sigml_seconds(sign('a')) == 0.6
+    assert estimate_sigml_seconds(sign('we', 1)) == 0.95
+    assert lexicon.word_seconds('We') == 0.95
+    # Fingerspelled letter by letter; characters without a sign are skipped
+    assert lexicon.word_seconds('fox') == 3 * 0.6
+    assert lexicon.word_seconds('dog.') == 3 * 0.6
+    assert lexicon.word_signs('hello') == [sign('hello')]
+    assert lexicon.word_signs('ox!') == [sign('o'), sign('x')]
+    # Nothing to fingerspell with: one sign per unknown word
+    assert SignLexicon().text_seconds('any three words') == 3 * SIGN_SECONDS
+    assert SignLexicon({'salute': sign('salute', 2)}).text_seconds('salute you') == 1.3 + SIGN_SECONDS
+
+
+def test_every_word_is_signed():
+    transcript = auto_captions()
+    for lexicon in (avatar_lexicon(), SignLexicon()):
+        windows = rechunk(transcript, lexicon)
+        assert len(windows) <= len(transcript)
+
+        previous_end = 0.0
+        for window in windows:
+            assert 'dropped' not in window
+            assert window['start'] >= previous_end - 1e-6
+            previous_end = window['start'] + window['duration']
+            # The window is long enough for the avatar to sign all of it
+            assert lexicon.condense(window['text'].split(), window['duration']) == window['text'].split()
+            assert lexicon.text_seconds(window['text']) <= window['duration'] + 1e-6
+
+
+def test_lag_cap_is_opt_in_and_reports_dropped_words(capsys):
+    lexicon = avatar_lexicon()
+    transcript = auto_captions(50)
+    speech_end = transcript.end(len(transcript) - 1)
+    windows = rechunk(transcript, lexicon, max_lag=2.0)
+    assert windows[-1]['start'] + windows[-1]['duration'] <= speech_end + 2.0 + 1e-6
+
+    dropped = [word for window in windows for word in window.get('dropped', ())]
+    assert dropped
+    for window in windows:
+        signed = lexicon.condense(window['text'].split(), window['duration'])
+        assert len(signed) + len(window.get('dropped', ())) == len(window['text'].split())
+
+    build_schedule(transcript, lexicon, max_lag=2.0)
+    assert f"leaves {len(dropped)} of" in capsys.readouterr().out
+
+
+def test_captions_keep_every_word():
+    transcript = auto_captions(50)
+    windows = rechunk(transcript, avatar_lexicon())
+    assert ' '.join(w['text'] for w in windows).split() == ' '.join(s['text'] for s in transcript).split()
+
+
+def test_windows_prefer_sentence_ends():
+    transcript = CompactTranscript.from_segments([
+        {'start': 0.0, 'duration': 2.0, 'text': 'hello world we'},
+        {'start': 2.0, 'duration': 2.0, 'text': 'are the sign.'},
+        {'start': 4.0, 'duration': 2.0, 'text': 'hello language'},
+        {'start': 6.0, 'duration': 2.0, 'text': 'to we.'},
+    ])
+    windows = rechunk(transcript, avatar_lexicon())
+    assert [w['text'] for w in windows] == ['hello world we are the sign.', 'hello language to we.']
+
+
+def test_condense_drops_costliest_words_first():
+    lexicon = avatar_lexicon()
+    words = ['hello', 'jumps', 'we', 'fox']
+    assert lexicon.condense(words, 100) == words
+    # 'jumps' (3 s) goes first, then 'fox' (1.8 s)
+    assert lexicon.condense(words, 4) == ['hello', 'we', 'fox']
+    assert lexicon.condense(words, 2) == ['hello', 'we']
+
+
+def test_directory_lexicon_splits_multi_sign_files(tmp_path):
+    (tmp_path / 'pair.sigml').write_text(
+        '<sigml>'
+        '<hns_sign gloss="one"><hamnosys_manual><hamfist/></hamnosys_manual></hns_sign>'
+        '<hns_sign gloss="two"><hamnosys_manual><hamflathand/><hammoveu/></hamnosys_manual></hns_sign>'
+        '</sigml>'
+    )
+    (tmp_path / 'empty.sigml').write_text('')
+    lexicon = SignLexicon.load(str(tmp_path))
+    assert sorted(lexicon.signs) == ['one', 'two']
+    assert 'hammoveu' not in lexicon.signs['one']
+    assert 'hamfist' not in lexicon.signs['two']
+
+
+def test_json_lexicon_and_schedule(tmp_path):
+    path = tmp_path / 'sigmlData.json'
+    path.write_text(json.dumps([{'w': 'Hello', 's': sign('hello')}]))
+    lexicon = SignLexicon.load(str(path))
+    assert lexicon.word_signs('HELLO') == [sign('hello')]
+    schedule = build_schedule(auto_captions(20), lexicon)
+    assert 0 < len(schedule) <= 20
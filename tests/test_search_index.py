@@ -0,0 +1,63 @@
+import json
+import os
+
+from accessible_ai.search_index import TranscriptIndex, build_match_query
+
+
+def write_transcript(directory, video_id, texts):
+    segments = [{'start': i * 2.0, 'duration': 2.0, 'text': text} for i, text in enumerate(texts)]
+    with open(os.path.join(directory, f"{video_id}.json"), 'w', encoding='utf-8') as f:
+        json.dump(segments, f)
+
+
+def test_match_query_quotes_terms_and_keeps_phrases():
+    assert build_match_query('hello "sign language" NOT') == '"hello" "sign language" "NOT"'
+    # An unbalanced quote is kept as a literal character of the term
+    assert build_match_query('say "hi') == '"say" """hi"'
+    assert build_match_query('   ') == ''
+
+
+def test_phrase_search_returns_timestamped_hits(tmp_path):
+    write_transcript(tmp_path, 'vid1', ["welcome to the show", "sign language avatar", "language sign"])
+    index = TranscriptIndex(str(tmp_path / 'index.db'))
+    assert index.ingest_directory(str(tmp_path)) == 1
+
+    hits = index.search('"sign language"')
+    assert hits == [{'video_id': 'vid1', 'start': 2.0, 'duration': 2.0, 'text': "sign language avatar"}]
+    assert len(index.search('sign language')) == 2
+    assert index.search('AND "welcome') == []
+
+
+def test_ingest_is_incremental_and_drops_deleted_files(tmp_path):
+    write_transcript(tmp_path, 'keep', ["hello world"])
+    write_transcript(tmp_path, 'gone', ["hello again"])
+    index = TranscriptIndex(str(tmp_path / 'index.db'))
+    assert index.ingest_directory(str(tmp_path)) == 2
+    assert index.ingest_directory(str(tmp_path)) == 0
+
+    os.remove(tmp_path / 'gone.json')
+    assert index.ingest_directory(str(tmp_path)) == 1
+    assert [hit['video_id'] for hit in index.search('hello')] == ['keep']
+
+
+def test_only_newest_matches_are_ranked(tmp_path):
+    write_transcript(tmp_path, 'a', ["sign here", "sign sign rare"])
+    write_transcript(tmp_path, 'b', ["sign here", "sign sign there"])
+    write_transcript(tmp_path, 'c', ["sign here", "sign sign there"])
+    index = TranscriptIndex(str(tmp_path / 'index.db'), rank_candidates=4)
+    index.ingest_directory(str(tmp_path))
+
+    hits = index.search('sign')
+    assert {hit['video_id'] for hit in hits} == {'b', 'c'}
+    assert [hit['text'] for hit in hits[:2]] == ["sign sign there"] * 2
+    # Rarer queries and a single video's segments are ranked in full
+    assert [hit['video_id'] for hit in index.search('sign rare')] == ['a']
+    assert [hit['text'] for hit in index.search('sign', video_id='a')] == ["sign sign rare", "sign here"]
+    assert index.search('sign', video_id='missing') == []
+
+
+def test_index_is_created_on_first_use(tmp_path):
+    index = TranscriptIndex(str(tmp_path / 'db' / 'index.db'))
+    assert not os.path.exists(tmp_path / 'db')
+    assert index.search('hello') == []
+    assert os.path.exists(tmp_path / 'db' / 'index.db')
@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip('flask')
+
+from accessible_ai.compact_transcript import CompactTranscript
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('transcripts')
+    for video_id, texts in (('talk', ["sign language today", "more sign language"]), ('demo', ["sign here"])):
+        segments = [{'start': i * 2.0, 'duration': 2.0, 'text': text} for i, text in enumerate(texts)]
+        (directory / f'{video_id}.json').write_text(json.dumps(segments))
+
+    # Settings are read when the module is imported
+    env = pytest.MonkeyPatch()
+    env.setenv('ACCESSIBLE_AI_TRANSCRIPTS_DIR', str(directory))
+    from accessible_ai import server
+
+    # Importing leaves the index alone; it is synced in the background
+    assert not os.path.exists(directory / 'index.db')
+    server.start_index_sync().join()
+
+    # Cached, so sessions for 'vid1' never go to YouTube
+    server.transcript_cache.put('vid1', CompactTranscript.from_segments([
+        {'start': 0.0, 'duration': 2.0, 'text': 'hello world.'},
+        {'start': 5.0, 'duration': 2.0, 'text': 'sign language.'},
+    ]))
+    yield server
+    env.undo()
+
+
+@pytest.fixture
+def client(server):
+    return server.app.test_client()
+
+
+def start_session(client):
+    response = client.post('/api/session', json={'id': 'vid1'})
+    assert response.status_code == 201
+    return response.get_json()['session']
+
+
+def test_unknown_session(client):
+    assert client.post('/api/session/nope/clock', json={'event': 'play'}).status_code == 404
+    assert client.get('/api/session/nope/stream').status_code == 404
+    assert client.delete('/api/session/nope').status_code == 404
+
+
+def test_session_needs_a_video_id(client):
+    assert client.post('/api/session', json={}).status_code == 400
+
+
+@pytest.mark.parametrize('body, error', [
+    ({'event': 'rewind'}, 'event must be'),
+    ({'event': 'seek', 'position': 'soon'}, 'must be numbers'),
+    ({'event': 'rate', 'rate': [2]}, 'must be numbers'),
+])
+def test_bad_clock_event(client, body, error):
+    session = start_session(client)
+    response = client.post(f'/api/session/{session}/clock', json=body)
+    assert response.status_code == 400
+    assert error in response.get_json()['error']
+    assert client.delete(f'/api/session/{session}').status_code == 204
+
+
+def test_stream_sends_ready_then_segments(client):
+    session = start_session(client)
+    assert client.post(f'/api/session/{session}/clock', json={'event': 'play', 'position': 0}).status_code == 204
+
+    response = client.get(f'/api/session/{session}/stream')
+    assert response.mimetype == 'text/event-stream'
+    events = (chunk.decode('utf-8') for chunk in response.response)
+    assert next(events) == f'event: ready\ndata: {json.dumps({"session": session})}\n\n'
+
+    name, data = next(events).rstrip('\n').split('\n')
+    assert name == 'event: segment'
+    segment = json.loads(data[len('data: '):])
+    assert segment['index'] == 0
+    assert segment['text'] == 'hello world.'
+    assert segment['sign_text'] == 'hello world.'
+    assert 'signs' not in segment
+    response.close()
+    client.delete(f'/api/session/{session}')
+
+
+def test_search(client):
+    hits = client.get('/api/search', query_string={'q': '"sign language"'}).get_json()['hits']
+    assert sorted((hit['video_id'], hit['start']) for hit in hits) == [('talk', 0.0), ('talk', 2.0)]
+
+    assert len(client.get('/api/search', query_string={'q': 'sign', 'video': 'demo'}).get_json()['hits']) == 1
+    assert client.get('/api/search', query_string={'q': 'sign', 'video': 'other'}).get_json()['hits'] == []
+
+
+@pytest.mark.parametrize('limit, count', [(0, 1), (2, 2), (1000, 3)])
+def test_search_limit_is_clamped(client, limit, count):
+    response = client.get('/api/search', query_string={'q': 'sign', 'limit': limit})
+    assert len(response.get_json()['hits']) == count
+
+
+@pytest.mark.parametrize('query_string', [{}, {'q': '  '}, {'q': 'sign', 'limit': 'ten'}])
+def test_bad_search(client, query_string):
+    assert client.get('/api/search', query_string=query_string).status_code == 400